@@ -0,0 +1,153 @@
+"""
+This script bundles all item information that is otherwise spread
+across several files into one indexed item metadata file:
+- MultiPic info + frequencies (`MultiPic_with_frequencies.csv`)
+- our example sentences (`example_sentences.ods`)
+- list membership + repetition flags (`items_lists/`)
+- duplicate item information
+
+The result is saved as a pickled dataframe with the MultiPic item
+number (ITEM) as its index, so single items or slices of items and
+columns can be looked up directly instead of merging the source files
+again in every script.
+
+PREREQUISITE: this script expects that the scripts
+`merge_multipic_subtlex.py` and `items_lists.py` have already run.
+
+TO RUN THE SCRIPT: open script location in terminal and type:
+$ python3 item_metadata.py
+
+TO USE THE BUNDLE in another script (from this directory):
+    from item_metadata import load_item_metadata
+    bundle = load_item_metadata(items=[1, 2], columns=['NAME1', 'EXAMPLE'])
+"""
+
+# import relevant packages
+import os
+import pandas as pd
+import numpy as np
+
+# define paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+mp_freq_path = os.path.join(script_dir, '../../external_resources/MultiPic_with_frequencies.csv')
+sentences_path = os.path.join(script_dir, '../data/example_sentences.ods')
+lists_path = os.path.join(script_dir, '../data/items_lists/')
+
+# saving path
+bundle_path = os.path.join(script_dir, '../data/item_metadata.pkl')
+
+# version of the bundle layout;
+# increase whenever columns are added, removed or renamed
+BUNDLE_VERSION = 1
+
+# define functions for easier use
+def remove_umlauts(string):
+    """ Removes umlauts and ß and lowercases strings.
+    Input:
+        string: A string.
+    Output:
+        new_string: Same string in lowercase and without umlauts.
+    """
+    umlauts = {'ä':'ae','ö':'oe','ü':'ue','ß':'ss'}
+    new_string = string.lower()
+    for umlaut in umlauts:
+        new_string = new_string.replace(umlaut, umlauts[umlaut])
+    return new_string
+
+def read_items_list(name):
+    """ Reads one of the item lists saved by `items_lists.py`.
+    Input:
+        name: File name without ending, e.g. 'list_A' or 'control_items'.
+    Output:
+        items: Set of item numbers in the list.
+    """
+    items = np.loadtxt(os.path.join(lists_path, name+'.csv'), dtype=int, ndmin=1)
+    return set(items)
+
+def build_item_metadata():
+    """ Combines MultiPic info, frequencies, example sentences, list
+    membership and duplicate information into one dataframe.
+    Input:
+        -
+    Output:
+        bundle_df: Dataframe with one row per MultiPic item, indexed by ITEM.
+    """
+    # MultiPic with frequencies
+    mp_freq_df = pd.read_csv(mp_freq_path)
+    # example sentences
+    sentences_df = pd.read_excel(sentences_path, engine='odf', usecols=[0,2], sheet_name='MultiPic')
+    bundle_df = mp_freq_df.merge(sentences_df, how='left', on='ITEM')
+
+    # normalised item name, as used for matching against SUBTLEX-DE
+    # and Birchenough et al. (2017)
+    bundle_df.insert(bundle_df.columns.get_loc('NAME1')+1, 'NAME_NORMALISED',
+                     [remove_umlauts(name).replace('-','') for name in bundle_df['NAME1']])
+
+    # list membership
+    bundle_df['LIST'] = None
+    for list_name, file_name in [('A', 'list_A'), ('B', 'list_B'), ('C', 'list_C'), ('control', 'control_items')]:
+        bundle_df.loc[bundle_df['ITEM'].isin(read_items_list(file_name)), 'LIST'] = list_name
+    # repetition flags
+    repeated_items = set()
+    for file_name in ['list_A_repeated', 'list_B_repeated', 'list_C_repeated']:
+        repeated_items |= read_items_list(file_name)
+    bundle_df['REPEATED'] = bundle_df['ITEM'].isin(repeated_items)
+
+    # duplicate information
+    # item names that occur more than once in MultiPic
+    bundle_df['NAME_OCCURS_SEVERAL_TIMES'] = bundle_df.duplicated(subset=['NAME1'], keep=False)
+    # truly duplicate items share the same item name and example sentence;
+    # only one of them was presented in the survey, so SURVEY_ITEM points
+    # to the item number whose ratings stand in for the current item
+    bundle_df['SURVEY_ITEM'] = bundle_df['ITEM']
+    presented_df = bundle_df[bundle_df['LIST'].notna()]
+    for i in bundle_df[bundle_df['LIST'].isna()].index:
+        twin = presented_df[(presented_df['NAME1'] == bundle_df.loc[i,'NAME1'])
+                            & (presented_df['EXAMPLE'] == bundle_df.loc[i,'EXAMPLE'])]
+        if len(twin) == 1:
+            bundle_df.loc[i,'SURVEY_ITEM'] = twin['ITEM'].values[0]
+        else:
+            print(f'Item {bundle_df.loc[i,"ITEM"]} is in no list and has no duplicate in the lists!')
+
+    bundle_df.set_index('ITEM', inplace=True)
+    if not bundle_df.index.is_unique:
+        raise ValueError('Item numbers in MultiPic_with_frequencies.csv are not unique!')
+    bundle_df.sort_index(inplace=True)
+    bundle_df.attrs['version'] = BUNDLE_VERSION
+    return bundle_df
+
+def load_item_metadata(items=None, columns=None, path=bundle_path):
+    """ Loads the item metadata bundle and returns the requested slice.
+    Input:
+        items: Item number or list of item numbers (optional; default: all items).
+        columns: Column name or list of column names (optional; default: all columns).
+        path: Path to the bundle (optional).
+    Output:
+        bundle_df: Requested slice of the bundle (indexed by ITEM).
+    """
+    bundle_df = pd.read_pickle(path)
+    version = bundle_df.attrs.get('version')
+    if version != BUNDLE_VERSION:
+        raise ValueError(f'Item metadata bundle has version {version}, expected {BUNDLE_VERSION}. '
+                         'Please rerun `item_metadata.py`.')
+    if items is None:
+        items = slice(None)
+    if columns is None:
+        columns = slice(None)
+    return bundle_df.loc[items, columns]
+
+######################################################################################
+if __name__ == '__main__':
+    print('>> Build item metadata bundle...')
+    bundle_df = build_item_metadata()
+    print('Done.')
+    print(f'Items in bundle: {len(bundle_df)}')
+    print('Items per list:')
+    print(bundle_df['LIST'].value_counts(dropna=False).to_string())
+    print(f'Repeated items: {bundle_df["REPEATED"].sum()}')
+
+    print('\n>> Save bundle...')
+    bundle_df.to_pickle(bundle_path)
+    print(f'Saved to {os.path.normpath(bundle_path)}')
+
+    print('\nEnd of script!')